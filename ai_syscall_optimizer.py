@@ -14,22 +14,152 @@
 import os
 import time
 import threading
-import numpy as np
+from collections import deque, OrderedDict
 from typing import Dict, List, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 import psutil
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, jsonify, render_template, request, Response
 from groq import Groq
 from dotenv import load_dotenv
 from bcc import BPF
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
 # Load environment variables from .env file
 load_dotenv()
 
 # Flask app setup
 app = Flask(__name__)
 
-@dataclass
+# Resource metrics are fixed at construction; keeping the key set static lets
+# updates mutate the impact dict in place instead of rebuilding it per event.
+RESOURCE_KEYS = ('cpu_percent', 'memory_percent', 'disk_io_percent')
+
+# BPF C source kept at module level so it is built once per interpreter.
+# bcc drives clang at load time and offers no supported path to reload a
+# precompiled object, so startup cost is bounded by compiling this program
+# exactly once per process.
+#
+# Aggregation happens in kernel: per-syscall count/total/min timings
+# accumulate in a BPF hash that userspace harvests every refresh interval,
+# instead of one perf event per syscall exit.
+_BPF_SOURCE = """
+#include <uapi/linux/ptrace.h>
+
+struct start_data_t {
+    u64 ts;         // Entry timestamp (nanoseconds)
+    u32 syscall_nr; // System call number
+};
+
+struct syscall_stats_t {
+    u64 count;      // Completed calls since last harvest
+    u64 total_ns;   // Sum of execution times
+    u64 min_ns;     // Fastest execution seen
+};
+
+BPF_HASH(start_times, u32, struct start_data_t); // Per-pid entry data
+BPF_HASH(stats, u32, struct syscall_stats_t);    // Per-syscall aggregates
+
+int trace_sys_enter(struct bpf_raw_tracepoint_args *ctx) {
+    u32 pid = bpf_get_current_pid_tgid() >> 32;
+    struct start_data_t start = {};
+    start.ts = bpf_ktime_get_ns();
+    start.syscall_nr = ctx->args[1];
+    start_times.update(&pid, &start);
+    return 0;
+}
+
+int trace_sys_exit(struct bpf_raw_tracepoint_args *ctx) {
+    u32 pid = bpf_get_current_pid_tgid() >> 32;
+    struct start_data_t *start = start_times.lookup(&pid);
+    if (start == 0) return 0;
+
+    u64 dt = bpf_ktime_get_ns() - start->ts;
+    u32 nr = start->syscall_nr;
+    start_times.delete(&pid);
+
+    struct syscall_stats_t zero = {};
+    struct syscall_stats_t *s = stats.lookup_or_try_init(&nr, &zero);
+    if (s == 0) return 0;
+    __sync_fetch_and_add(&s->count, 1);
+    __sync_fetch_and_add(&s->total_ns, dt);
+    if (s->min_ns == 0 || dt < s->min_ns) s->min_ns = dt;
+    return 0;
+}
+"""
+
+# Rule-based strategy templates, parameterized only by syscall name; built
+# once here instead of per _generate_mitigation_strategy call
+_CATEGORY_STRATEGY_TEMPLATES = {
+    "File I/O": (
+        "Implement buffered I/O for {name} to reduce system call frequency",
+        "Use asynchronous I/O for {name} operations to avoid blocking",
+        "Consider memory-mapped files instead of direct {name} calls"
+    ),
+    "Memory": (
+        "Optimize memory allocation patterns around {name}",
+        "Consider using huge pages to reduce {name} overhead",
+        "Implement memory pooling to reduce fragmentation in {name}"
+    ),
+    "Process": (
+        "Minimize {name} calls through process reuse",
+        "Use thread pools instead of frequent {name} calls",
+        "Implement process caching for {name} operations"
+    ),
+    "Synchronization": (
+        "Reduce lock contention around {name}",
+        "Use lock-free algorithms when possible to avoid {name}",
+        "Implement batching to reduce {name} frequency"
+    ),
+    "IPC": (
+        "Use shared memory instead of pipes for {name}",
+        "Batch messages to reduce {name} overhead",
+        "Consider using zero-copy techniques for {name}"
+    ),
+    "Time": (
+        "Cache time values to reduce {name} frequency",
+        "Use monotonic clocks for performance-sensitive code around {name}",
+        "Batch operations that require timestamp from {name}"
+    )
+}
+
+_DEFAULT_STRATEGY_TEMPLATES = (
+    "Implement advanced caching for {name}",
+    "Optimize memory allocation for {name}",
+    "Implement adaptive batching for {name}",
+    "Create intelligent parallelization strategy for {name}",
+    "Apply machine learning-based optimization for {name}"
+)
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _welford_step(mean: float, m2: float, count: int, value: float):
+    """One Welford update; returns the new (mean, m2) pair"""
+    delta = value - mean
+    new_mean = mean + delta / count
+    return new_mean, m2 + delta * (value - new_mean)
+
+
+if njit is not None:
+    # Compile the numeric kernel to native code when numba is installed;
+    # cache=True keeps the compiled artifact across process restarts
+    _welford_step = njit(cache=True)(_welford_step)
+
+
+@dataclass(slots=True)
 class SyscallPerformanceRecord:
     name: str
     average_time: float
@@ -39,16 +169,45 @@ class SyscallPerformanceRecord:
     last_optimized: float
     resource_impact: Dict[str, float]
     category: str  # Added category field for better organization
+    m2: float = 0.0  # Running sum of squared deviations for Welford's variance
+    max_impact: float = 0.0  # Largest resource impact, maintained at record time
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Shallow dict of the record; avoids asdict()'s deep-copy reflection"""
+        data = {k: getattr(self, k) for k in self.__slots__}
+        data['resource_impact'] = dict(self.resource_impact)
+        return data
 
 class AISystemCallOptimizer:
     def __init__(self, performance_threshold: float = 0.05, learning_rate: float = 0.1, groq_api_key: str = None):
-        self.performance_records: Dict[str, SyscallPerformanceRecord] = {}
-        self.optimization_history: List[Dict] = []
+        # Records are sharded into lock-striped buckets so the eBPF consumer
+        # and HTTP readers contend per-syscall rather than on one global lock
+        self._bucket_mask = 15
+        self._buckets = [(threading.Lock(), {}) for _ in range(self._bucket_mask + 1)]
+        # Bounded so a long-running process cannot leak history entries
+        self.optimization_history: deque = deque(maxlen=1000)
         self.recommendations_dict: Dict[str, str] = {}  # Store recommendations for each syscall
         self.performance_threshold = performance_threshold
         self.learning_rate = learning_rate
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()  # Guards recommendation/history state only
+        # Activity timestamps drive the monitor thread's adaptive backoff
+        self._last_event_ts = 0.0
+        self._last_http_ts = 0.0
+        # Serialized /performance payload, regenerated only when events arrive
+        # and at most once per second; concurrent readers share one rebuild
+        self._perf_cache: bytes = b'{}'
+        self._perf_dirty = True
+        self._perf_cache_ts = 0.0
+        self._perf_cache_window = 1.0  # seconds
+        self._perf_cache_lock = threading.Lock()
+        psutil.cpu_percent(interval=None)  # Prime so later non-blocking reads are meaningful
+        # Disk usage moves on minute scales; cache it to avoid a statvfs
+        # syscall on every resource sample
+        self._disk_cache_ts = 0.0
+        self._disk_cache_val = 0.0
+        self._disk_cache_ttl = 30  # seconds
         self.global_resource_baseline = self._capture_system_resources()
+        self.latest_resources = self.global_resource_baseline
 
         # Expanded syscall map with categories
         self.syscall_map = {
@@ -110,147 +269,262 @@ class AISystemCallOptimizer:
             293: {"name": "pipe2", "category": "IPC"}
         }
 
+        # Flatten the map into parallel arrays indexed by syscall number so
+        # the perf-buffer callback does an array index instead of a dict
+        # lookup plus default-dict allocation per event
+        self._syscall_map_size = max(self.syscall_map) + 1
+        self._syscall_names = [f"unknown_{nr}" for nr in range(self._syscall_map_size)]
+        self._syscall_categories = ["Unknown"] * self._syscall_map_size
+        for nr, info in self.syscall_map.items():
+            self._syscall_names[nr] = info["name"]
+            self._syscall_categories[nr] = info["category"]
+
         if groq_api_key:
             self.groq_client = Groq(api_key=groq_api_key)
             print(f"Groq client initialized with API key: {groq_api_key[:5]}...")
         else:
             self.groq_client = None
             print("No Groq API key provided, falling back to rule-based strategy.")
+        # Cache LLM suggestions keyed by a quantized record signature so
+        # near-identical states reuse a prior answer instead of a Groq
+        # call. Bounded LRU: the quantized average time in the key drifts
+        # as batches harvest, so without eviction a long-running process
+        # accumulates entries indefinitely. The lock covers get/move/evict.
+        self._llm_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._llm_cache_lock = threading.Lock()
+        self._llm_cache_ttl = 3600  # seconds
+        self._llm_cache_size = 256
+        # Static prompt parts built once; the per-record loop only fills values
+        self._llm_system_message = {
+            "role": "system",
+            "content": "You are an AI assistant specialized in system performance optimization. Provide your suggestions in plain text without code or special formatting."
+        }
+        self._llm_prompt_template = """
+You are an AI assistant specialized in system performance optimization. Based on the following performance data for a system call, suggest a specific and concise optimization strategy to improve its performance or reduce its resource usage. Provide a brief, actionable suggestion in plain text, in one or two sentences, without code or special formatting.
+
+System Call: {name}
+Category: {category}
+Average Execution Time: {average_time:.4f} seconds
+Variance: {variance:.4f}
+Peak Performance: {peak_performance:.4f} seconds
+Resource Impacts:
+- CPU: {cpu:.2f}%
+- Memory: {memory:.2f}%
+- Disk I/O: {disk:.2f}%
+"""
+        # Set a consistent refresh interval (in seconds); the kernel-stats
+        # harvest thread reads it, so it must exist before monitoring starts
+        self.refresh_interval = 5
+
         self.bpf = None
         self.start_ebpf_monitoring()
         threading.Thread(target=self.resource_monitoring_thread, daemon=True).start()
-
-        # Set a consistent refresh interval (in seconds)
-        self.refresh_interval = 5
         print(f"Performance data will refresh every {self.refresh_interval} seconds")
 
+    def _disk_usage_percent(self) -> float:
+        now = time.time()
+        if now - self._disk_cache_ts > self._disk_cache_ttl:
+            self._disk_cache_val = psutil.disk_usage('/').percent
+            self._disk_cache_ts = now
+        return self._disk_cache_val
+
     def _capture_system_resources(self) -> Dict[str, float]:
         return {
-            'cpu_percent': psutil.cpu_percent(interval=0.1),
+            'cpu_percent': psutil.cpu_percent(interval=None),
             'memory_percent': psutil.virtual_memory().percent,
-            'disk_io_percent': psutil.disk_usage('/').percent
+            'disk_io_percent': self._disk_usage_percent()
         }
 
     def resource_monitoring_thread(self):
         while True:
-            self.global_resource_baseline = self._capture_system_resources()
-            time.sleep(1)  # Update baseline every second
+            # Previous sample becomes the baseline; events diff latest vs baseline
+            latest = self._capture_system_resources()
+            self.global_resource_baseline = self.latest_resources
+            self.latest_resources = latest
+            # Back off to 5 s when neither syscall events nor dashboard
+            # reads have happened recently; nobody consumes the samples
+            now = time.time()
+            if now - self._last_event_ts > 10 and now - self._last_http_ts > 30:
+                time.sleep(5)
+            else:
+                time.sleep(1)
 
     def start_ebpf_monitoring(self):
-        bpf_code = """
-        #include <uapi/linux/ptrace.h>
-
-        struct syscall_data_t {
-            u32 pid;        // Process ID
-            u64 ts;         // Timestamp (nanoseconds)
-            u32 syscall_nr; // System call number
-        };
-
-        BPF_HASH(start_times, u32, u64);         // Map to store start times
-        BPF_PERF_OUTPUT(events);                 // Output buffer to user space
-
-        int trace_sys_enter(struct bpf_raw_tracepoint_args *ctx) {
-            u32 pid = bpf_get_current_pid_tgid() >> 32;
-            u64 ts = bpf_ktime_get_ns();
-            start_times.update(&pid, &ts);
-            return 0;
-        }
-
-        int trace_sys_exit(struct bpf_raw_tracepoint_args *ctx) {
-            u32 pid = bpf_get_current_pid_tgid() >> 32;
-            u64 *start_ts = start_times.lookup(&pid);
-            if (start_ts == 0) return 0;
-
-            struct syscall_data_t data = {};
-            data.pid = pid;
-            data.ts = bpf_ktime_get_ns() - *start_ts;
-            data.syscall_nr = ctx->args[1];
-            events.perf_submit(ctx, &data, sizeof(data));
-            start_times.delete(&pid);
-            return 0;
-        }
-        """
-        self.bpf = BPF(text=bpf_code)
+        self.bpf = BPF(text=_BPF_SOURCE)
         self.bpf.attach_raw_tracepoint(tp="sys_enter", fn_name="trace_sys_enter")
         self.bpf.attach_raw_tracepoint(tp="sys_exit", fn_name="trace_sys_exit")
+        threading.Thread(target=self.poll_kernel_stats, daemon=True).start()
 
-        def process_event(cpu, data, size):
-            event = self.bpf["events"].event(data)
-            syscall_info = self.syscall_map.get(event.syscall_nr, {"name": f"unknown_{event.syscall_nr}", "category": "Unknown"})
-            syscall_name = syscall_info["name"]
-            syscall_category = syscall_info["category"]
-            execution_time = event.ts / 1e9  # Convert ns to seconds
-            self.record_syscall_performance(syscall_name, execution_time, syscall_category)
+    def poll_kernel_stats(self):
+        """Harvest in-kernel per-syscall aggregates every refresh interval"""
+        stats = self.bpf["stats"]
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                batch = list(stats.items_lookup_and_delete_batch())
+            except Exception:
+                # Older kernels/bcc lack batch ops; fall back to scan + clear
+                batch = [(k, v) for k, v in stats.items()]
+                stats.clear()
+            for key, value in batch:
+                if value.count == 0:
+                    continue
+                nr = key.value
+                if nr < self._syscall_map_size:
+                    syscall_name = self._syscall_names[nr]
+                    syscall_category = self._syscall_categories[nr]
+                else:
+                    syscall_name = f"unknown_{nr}"
+                    syscall_category = "Unknown"
+                self.record_syscall_batch(
+                    syscall_name,
+                    count=value.count,
+                    total_time=value.total_ns / 1e9,
+                    min_time=value.min_ns / 1e9,
+                    category=syscall_category
+                )
 
-        self.bpf["events"].open_perf_buffer(process_event)
-        threading.Thread(target=self.poll_ebpf_events, daemon=True).start()
+    def _bucket_for(self, syscall_name: str):
+        return self._buckets[hash(syscall_name) & self._bucket_mask]
 
-    def poll_ebpf_events(self):
-        while True:
-            self.bpf.perf_buffer_poll()
+    def record_syscall_batch(self, syscall_name: str, count: int, total_time: float,
+                             min_time: float, category: str = "Unknown"):
+        """Merge a harvested (count, total, min) aggregate into the record"""
+        lock, records = self._bucket_for(syscall_name)
+        with lock:
+            self._record_batch(records, syscall_name, count, total_time, min_time, category)
 
     def record_syscall_performance(self, syscall_name: str, execution_time: float, category: str = "Unknown"):
-        with self.lock:
-            current_resources = self._capture_system_resources()
-            resource_impact = {
-                k: max(0, current_resources[k] - self.global_resource_baseline.get(k, 0))
-                for k in current_resources
-            }
-
-            if syscall_name not in self.performance_records:
-                self.performance_records[syscall_name] = SyscallPerformanceRecord(
-                    name=syscall_name,
-                    average_time=execution_time,
-                    execution_count=1,
-                    variance=0,
-                    peak_performance=execution_time,
-                    last_optimized=time.time(),
-                    resource_impact=resource_impact,
-                    category=category
-                )
-            else:
-                record = self.performance_records[syscall_name]
-                total_executions = record.execution_count + 1
-                new_average = (
-                    record.average_time * record.execution_count + execution_time
-                ) / total_executions
-                variance = np.var([record.average_time, execution_time])
-
-                aggregated_impact = {
-                    k: (record.resource_impact.get(k, 0) * record.execution_count +
-                        resource_impact.get(k, 0)) / total_executions
-                    for k in set(record.resource_impact) | set(resource_impact)
-                }
+        lock, records = self._bucket_for(syscall_name)
+        with lock:
+            self._record_event(records, syscall_name, execution_time, category)
+
+    def _record_event(self, records, syscall_name: str, execution_time: float, category: str = "Unknown"):
+        """Update a record for one event; caller must hold the bucket lock"""
+        # Snapshot the monitor thread's samples instead of blocking on
+        # psutil per event; dict rebinds are atomic so no extra locking
+        baseline = self.global_resource_baseline
+        latest = self.latest_resources
+        resource_impact = {
+            k: max(0, latest[k] - baseline.get(k, 0))
+            for k in RESOURCE_KEYS
+        }
 
-                self.performance_records[syscall_name] = SyscallPerformanceRecord(
-                    name=syscall_name,
-                    average_time=new_average,
-                    execution_count=total_executions,
-                    variance=variance,
-                    peak_performance=min(record.peak_performance, execution_time),
-                    last_optimized=record.last_optimized,
-                    resource_impact=aggregated_impact,
-                    category=record.category
-                )
+        if syscall_name not in records:
+            records[syscall_name] = SyscallPerformanceRecord(
+                name=syscall_name,
+                average_time=execution_time,
+                execution_count=1,
+                variance=0,
+                peak_performance=execution_time,
+                last_optimized=time.time(),
+                resource_impact=resource_impact,
+                category=category,
+                max_impact=max(resource_impact.values())
+            )
+        else:
+            record = records[syscall_name]
+            total_executions = record.execution_count + 1
+
+            # Welford's online algorithm: exact running variance with
+            # plain float arithmetic, no NumPy array per event
+            new_average, record.m2 = _welford_step(
+                record.average_time, record.m2, total_executions, execution_time
+            )
+
+            impact = record.resource_impact
+            max_impact = 0.0
+            for k in RESOURCE_KEYS:
+                value = (impact[k] * record.execution_count +
+                         resource_impact[k]) / total_executions
+                impact[k] = value
+                if value > max_impact:
+                    max_impact = value
+            record.max_impact = max_impact
+
+            record.average_time = new_average
+            record.execution_count = total_executions
+            record.variance = record.m2 / total_executions
+            record.peak_performance = min(record.peak_performance, execution_time)
+        self._perf_dirty = True
+        self._last_event_ts = time.time()
+
+    def _record_batch(self, records, syscall_name: str, count: int, total_time: float,
+                      min_time: float, category: str = "Unknown"):
+        """Fold a kernel-side aggregate into a record; caller holds the bucket lock"""
+        baseline = self.global_resource_baseline
+        latest = self.latest_resources
+        resource_impact = {
+            k: max(0, latest[k] - baseline.get(k, 0))
+            for k in RESOURCE_KEYS
+        }
+        batch_mean = total_time / count
+
+        if syscall_name not in records:
+            records[syscall_name] = SyscallPerformanceRecord(
+                name=syscall_name,
+                average_time=batch_mean,
+                execution_count=count,
+                variance=0,
+                peak_performance=min_time,
+                last_optimized=time.time(),
+                resource_impact=resource_impact,
+                category=category,
+                max_impact=max(resource_impact.values())
+            )
+        else:
+            record = records[syscall_name]
+            previous_count = record.execution_count
+            total_executions = previous_count + count
+
+            # Chan et al. merge, treating the batch as `count` samples at its
+            # mean; within-batch spread is not recoverable from the aggregates
+            delta = batch_mean - record.average_time
+            record.average_time += delta * count / total_executions
+            record.m2 += delta * delta * previous_count * count / total_executions
+
+            impact = record.resource_impact
+            max_impact = 0.0
+            for k in RESOURCE_KEYS:
+                value = (impact[k] * previous_count +
+                         resource_impact[k] * count) / total_executions
+                impact[k] = value
+                if value > max_impact:
+                    max_impact = value
+            record.max_impact = max_impact
+
+            record.execution_count = total_executions
+            record.variance = record.m2 / total_executions
+            record.peak_performance = min(record.peak_performance, min_time)
+        self._perf_dirty = True
+        self._last_event_ts = time.time()
 
     def generate_optimization_strategy(self) -> List[Dict[str, Any]]:
+        # Snapshot records bucket by bucket, then build recommendations
+        # (including any Groq calls) without holding any bucket lock
+        candidates = []
+        for lock, records in self._buckets:
+            with lock:
+                candidates.extend(records.values())
+
         recommendations = []
-        with self.lock:
-            for syscall, record in self.performance_records.items():
-                if (record.average_time > self.performance_threshold or
-                    any(impact > 50 for impact in record.resource_impact.values())):
-                    recommendation = {
-                        "syscall": syscall,
-                        "current_performance": record.average_time,
-                        "recommendation_type": self._get_recommendation_type(record),
-                        "suggested_action": self._generate_mitigation_strategy(record),
-                        "resource_impact": record.resource_impact,
-                        "category": record.category
-                    }
-                    recommendations.append(recommendation)
+        for record in candidates:
+            if (record.average_time > self.performance_threshold or
+                record.max_impact > 50):
+                recommendation = {
+                    "syscall": record.name,
+                    "current_performance": record.average_time,
+                    "recommendation_type": self._get_recommendation_type(record),
+                    "suggested_action": self._generate_mitigation_strategy(record),
+                    "resource_impact": record.resource_impact,
+                    "category": record.category
+                }
+                recommendations.append(recommendation)
 
+        with self.lock:
             # Update the recommendations dictionary
             self.recommendations_dict = {rec['syscall']: rec['suggested_action'] for rec in recommendations}
+            self._perf_dirty = True  # Payload embeds recommendations
 
             self.optimization_history.append({
                 "timestamp": time.time(),
@@ -260,8 +534,7 @@ class AISystemCallOptimizer:
         return recommendations
 
     def _get_recommendation_type(self, record: SyscallPerformanceRecord) -> str:
-        high_resource_impact = any(impact > 50 for impact in record.resource_impact.values())
-        if high_resource_impact:
+        if record.max_impact > 50:
             return "CRITICAL_RESOURCE_BOTTLENECK"
         elif record.variance > record.average_time * 0.5:
             return "HIGH_VARIABILITY"
@@ -270,26 +543,41 @@ class AISystemCallOptimizer:
         else:
             return "MODERATE_OPTIMIZATION"
 
+    def _llm_cache_key(self, record: SyscallPerformanceRecord) -> tuple:
+        """Quantized signature: nearby metric values share a cache entry"""
+        impact = record.resource_impact
+        return (
+            record.name,
+            record.category,
+            round(record.average_time, 3),
+            int(impact.get('cpu_percent', 0) // 10),
+            int(impact.get('memory_percent', 0) // 10),
+            int(impact.get('disk_io_percent', 0) // 10)
+        )
+
     def _generate_mitigation_strategy(self, record: SyscallPerformanceRecord) -> str:
         if self.groq_client:
-            prompt = f"""
-You are an AI assistant specialized in system performance optimization. Based on the following performance data for a system call, suggest a specific and concise optimization strategy to improve its performance or reduce its resource usage. Provide a brief, actionable suggestion in plain text, in one or two sentences, without code or special formatting.
-
-System Call: {record.name}
-Category: {record.category}
-Average Execution Time: {record.average_time:.4f} seconds
-Variance: {record.variance:.4f}
-Peak Performance: {record.peak_performance:.4f} seconds
-Resource Impacts:
-- CPU: {record.resource_impact.get('cpu_percent', 0):.2f}%
-- Memory: {record.resource_impact.get('memory_percent', 0):.2f}%
-- Disk I/O: {record.resource_impact.get('disk_io_percent', 0):.2f}%
-"""
+            cache_key = self._llm_cache_key(record)
+            with self._llm_cache_lock:
+                cached = self._llm_cache.get(cache_key)
+                if cached and time.time() - cached[0] < self._llm_cache_ttl:
+                    self._llm_cache.move_to_end(cache_key)
+                    return cached[1]
+            prompt = self._llm_prompt_template.format(
+                name=record.name,
+                category=record.category,
+                average_time=record.average_time,
+                variance=record.variance,
+                peak_performance=record.peak_performance,
+                cpu=record.resource_impact.get('cpu_percent', 0),
+                memory=record.resource_impact.get('memory_percent', 0),
+                disk=record.resource_impact.get('disk_io_percent', 0)
+            )
             try:
                 response = self.groq_client.chat.completions.create(
                     model="llama3-8b-8192",
                     messages=[
-                        {"role": "system", "content": "You are an AI assistant specialized in system performance optimization. Provide your suggestions in plain text without code or special formatting."},
+                        self._llm_system_message,
                         {"role": "user", "content": prompt}
                     ],
                     max_tokens=75,
@@ -298,56 +586,20 @@ Resource Impacts:
                 suggestion = response.choices[0].message.content.strip()
                 if suggestion:
                     suggestion = ' '.join(suggestion.split())
+                    with self._llm_cache_lock:
+                        self._llm_cache[cache_key] = (time.time(), suggestion)
+                        self._llm_cache.move_to_end(cache_key)
+                        if len(self._llm_cache) > self._llm_cache_size:
+                            self._llm_cache.popitem(last=False)
                     return suggestion
                 else:
                     print("AI returned empty suggestion, falling back to rule-based strategy.")
             except Exception as e:
                 print(f"Error generating strategy with Groq API: {e}")
 
-        # Category-based strategies
-        category_strategies = {
-            "File I/O": [
-                f"Implement buffered I/O for {record.name} to reduce system call frequency",
-                f"Use asynchronous I/O for {record.name} operations to avoid blocking",
-                f"Consider memory-mapped files instead of direct {record.name} calls"
-            ],
-            "Memory": [
-                f"Optimize memory allocation patterns around {record.name}",
-                f"Consider using huge pages to reduce {record.name} overhead",
-                f"Implement memory pooling to reduce fragmentation in {record.name}"
-            ],
-            "Process": [
-                f"Minimize {record.name} calls through process reuse",
-                f"Use thread pools instead of frequent {record.name} calls",
-                f"Implement process caching for {record.name} operations"
-            ],
-            "Synchronization": [
-                f"Reduce lock contention around {record.name}",
-                f"Use lock-free algorithms when possible to avoid {record.name}",
-                f"Implement batching to reduce {record.name} frequency"
-            ],
-            "IPC": [
-                f"Use shared memory instead of pipes for {record.name}",
-                f"Batch messages to reduce {record.name} overhead",
-                f"Consider using zero-copy techniques for {record.name}"
-            ],
-            "Time": [
-                f"Cache time values to reduce {record.name} frequency",
-                f"Use monotonic clocks for performance-sensitive code around {record.name}",
-                f"Batch operations that require timestamp from {record.name}"
-            ]
-        }
-
-        if record.category in category_strategies:
-            strategies = category_strategies[record.category]
-        else:
-            strategies = [
-                f"Implement advanced caching for {record.name}",
-                f"Optimize memory allocation for {record.name}",
-                f"Implement adaptive batching for {record.name}",
-                f"Create intelligent parallelization strategy for {record.name}",
-                f"Apply machine learning-based optimization for {record.name}"
-            ]
+        # Category-based strategies; only the chosen template is formatted
+        templates = _CATEGORY_STRATEGY_TEMPLATES.get(
+            record.category, _DEFAULT_STRATEGY_TEMPLATES)
 
         resource_weights = {
             'cpu_percent': record.resource_impact.get('cpu_percent', 0),
@@ -355,35 +607,58 @@ Resource Impacts:
             'disk_io_percent': record.resource_impact.get('disk_io_percent', 0)
         }
         max_resource_type = max(resource_weights, key=resource_weights.get)
-        strategy_index = min(int(resource_weights[max_resource_type] / 20), len(strategies) - 1)
-        return strategies[strategy_index]
+        strategy_index = min(int(resource_weights[max_resource_type] / 20), len(templates) - 1)
+        return templates[strategy_index].format(name=record.name)
 
     def get_performance_data(self) -> Dict[str, Any]:
-        with self.lock:
-            data = {}
-            for k, v in self.performance_records.items():
-                record_dict = asdict(v)
-                record_dict['recommendation'] = self.recommendations_dict.get(k, '')
-                data[k] = record_dict
-            return data
+        data = {}
+        for lock, records in self._buckets:
+            with lock:
+                for k, v in records.items():
+                    record_dict = v.to_dict()
+                    record_dict['recommendation'] = self.recommendations_dict.get(k, '')
+                    data[k] = record_dict
+        return data
+
+    def get_performance_data_bytes(self) -> bytes:
+        """Serialized performance payload with single-flight rebuilds.
+
+        Cached bytes are returned without touching any bucket lock while the
+        data is unchanged or still inside the coalescing window; at most one
+        request per window pays the serialization cost.
+        """
+        self._last_http_ts = time.time()
+        if (not self._perf_dirty or
+                time.time() - self._perf_cache_ts < self._perf_cache_window):
+            return self._perf_cache
+        with self._perf_cache_lock:
+            # Re-check after acquiring; a concurrent request may have rebuilt
+            if (self._perf_dirty and
+                    time.time() - self._perf_cache_ts >= self._perf_cache_window):
+                self._perf_cache = _json_dumps(self.get_performance_data())
+                self._perf_cache_ts = time.time()
+                self._perf_dirty = False
+        return self._perf_cache
 
     def get_refresh_interval(self) -> int:
         return self.refresh_interval
 
     def get_syscall_categories(self) -> Dict[str, List[str]]:
         categories = {}
-        with self.lock:
-            for syscall, record in self.performance_records.items():
-                category = record.category
-                if category not in categories:
-                    categories[category] = []
-                categories[category].append(syscall)
+        for lock, records in self._buckets:
+            with lock:
+                for syscall, record in records.items():
+                    category = record.category
+                    if category not in categories:
+                        categories[category] = []
+                    categories[category].append(syscall)
         return categories
 
     def get_syscall_details(self, syscall_name: str) -> Dict[str, Any]:
-        with self.lock:
-            if syscall_name in self.performance_records:
-                record_dict = asdict(self.performance_records[syscall_name])
+        lock, records = self._bucket_for(syscall_name)
+        with lock:
+            if syscall_name in records:
+                record_dict = records[syscall_name].to_dict()
                 record_dict['recommendation'] = self.recommendations_dict.get(syscall_name, '')
                 return record_dict
             return {"error": "System call not found"}
@@ -400,7 +675,7 @@ def index():
 
 @app.route('/performance')
 def get_performance():
-    return jsonify(syscall_optimizer.get_performance_data())
+    return Response(syscall_optimizer.get_performance_data_bytes(), mimetype='application/json')
 
 @app.route('/recommendations')
 def get_recommendations():
@@ -416,4 +691,7 @@ def get_syscall_details(syscall_name):
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))  # Default to 5000 locally
-    app.run(host='0.0.0.0', port=port)
\ No newline at end of file
+    # threaded=True so a slow /recommendations (Groq round-trip) does not
+    # block concurrent /performance refreshes; production uses gunicorn
+    # gthread workers (see Procfile)
+    app.run(host='0.0.0.0', port=port, threaded=True)
\ No newline at end of file
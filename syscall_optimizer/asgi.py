@@ -18,3 +18,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'syscall_optimizer.settings')
 
 application = get_asgi_application()
 
+# Schedule the optimizer's monitoring loop on the server's event loop
+# instead of spawning per-worker daemon threads (no-op if already started)
+from optimizer.optimizer import syscall_optimizer
+
+syscall_optimizer.start_background_tasks()
+
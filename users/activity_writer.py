@@ -0,0 +1,118 @@
+"""
+------------------------------------------------------------
+ File        : users/activity_writer.py
+ Author      : Nandan A M
+ Description : Buffered writer for activity log entries. Queues
+               rows in memory and inserts them in batches off the
+               request thread instead of one INSERT per hit.
+ Created On  : 12-Dec-2025
+ Version     : 1.0
+------------------------------------------------------------
+"""
+
+import atexit
+import queue
+import signal
+import threading
+
+# Unbounded: entries are small and the drainer keeps up; dropping logs
+# under pressure would be worse than the memory
+_q = queue.Queue()
+_batch_size = 500
+_drain_timeout = 1.0  # seconds to wait for more rows before flushing
+_writer_started = False
+_start_lock = threading.Lock()
+
+
+def log(**kwargs):
+    """Queue an ActivityLog row for background insertion.
+
+    Takes the same keyword arguments as ActivityLog.objects.create but
+    returns immediately; the INSERT happens in the writer thread as part
+    of a bulk_create, so the login/QR hot path never waits on it.
+    """
+    from .models import ActivityLog
+
+    _ensure_writer()
+    _q.put_nowait(ActivityLog(**kwargs))
+
+
+def _ensure_writer():
+    global _writer_started
+    if _writer_started:
+        return
+    with _start_lock:
+        if not _writer_started:
+            _writer_started = True
+            threading.Thread(target=_drain_loop, daemon=True).start()
+            atexit.register(flush)
+            _install_sigterm_flush()
+
+
+def _install_sigterm_flush():
+    # Flush before the process exits on SIGTERM; only the main thread may
+    # set handlers, and servers embedding us may have installed their own
+    if threading.current_thread() is not threading.main_thread():
+        return
+    previous = signal.getsignal(signal.SIGTERM)
+
+    def _on_sigterm(signum, frame):
+        flush()
+        if callable(previous):
+            previous(signum, frame)
+        else:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.raise_signal(signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, _on_sigterm)
+
+
+# Rows the drainer has dequeued but not yet inserted; shared with flush()
+# so a shutdown flush cannot miss what is sitting in the current batch
+_inflight = []
+_inflight_lock = threading.Lock()
+
+
+def _drain_loop():
+    while True:
+        item = _q.get()  # block until there is work
+        with _inflight_lock:
+            _inflight.append(item)
+        try:
+            while len(_inflight) < _batch_size:
+                item = _q.get(timeout=_drain_timeout)
+                with _inflight_lock:
+                    _inflight.append(item)
+        except queue.Empty:
+            pass
+        _flush_inflight()
+
+
+def _flush_inflight():
+    with _inflight_lock:
+        batch = list(_inflight)
+        _inflight.clear()
+    if batch:
+        _insert(batch)
+
+
+def _insert(batch):
+    from .models import ActivityLog
+
+    ActivityLog.objects.bulk_create(batch, batch_size=_batch_size, ignore_conflicts=True)
+
+
+def flush():
+    """Insert everything pending right now: both the queued rows and the
+    batch the drainer has dequeued but not yet written"""
+    batch = []
+    try:
+        while True:
+            batch.append(_q.get_nowait())
+    except queue.Empty:
+        pass
+    with _inflight_lock:
+        batch = _inflight + batch
+        _inflight.clear()
+    if batch:
+        _insert(batch)
@@ -12,8 +12,12 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import CustomUser, QRCode
+from . import token_cache
+from .models import CustomUser, QRCode, _new_token
 
 
 @admin.register(CustomUser)
@@ -21,9 +25,15 @@ class CustomUserAdmin(BaseUserAdmin):
     """Admin interface for CustomUser"""
     list_display = ['username', 'email', 'role', 'is_active', 'date_joined', 'has_qr_code']
     list_filter = ['role', 'is_active', 'is_staff', 'is_superuser', 'date_joined']
-    search_fields = ['username', 'email', 'first_name', 'last_name']
+    # Prefix lookups produce LIKE 'q%' queries the column indexes can
+    # serve; the old contains-match scanned all four columns per search
+    search_fields = ['^username', '^email', '^last_name', 'first_name']
+    search_help_text = 'Prefix match on username, email and last name'
     ordering = ['-date_joined']
-    
+    # Join the QR code in the changelist query; has_qr_code would
+    # otherwise SELECT against the QRCode table once per row
+    list_select_related = ('qr_code',)
+
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Information', {
             'fields': ('role', 'phone_number',)
@@ -37,9 +47,13 @@ class CustomUserAdmin(BaseUserAdmin):
     )
     
     actions = ['make_admin', 'make_staff', 'make_user']
-    
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('qr_code')
+
     def has_qr_code(self, obj):
-        return hasattr(obj, 'qr_code')
+        # Served from the select_related cache; no query per row
+        return getattr(obj, 'qr_code', None) is not None
     has_qr_code.boolean = True
     has_qr_code.short_description = 'Has QR Code'
     
@@ -64,7 +78,13 @@ class QRCodeAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'user__email', 'token']
     readonly_fields = ['token', 'created_at', 'last_used', 'revoked_at', 'qr_image_preview']
     ordering = ['-created_at']
-    
+    # JOIN the user in the changelist query; rendering the user column
+    # would otherwise SELECT the related row per QR code
+    list_select_related = ('user',)
+    # Search-as-you-type widget instead of loading every user into the
+    # FK dropdown on the add/change form
+    autocomplete_fields = ('user',)
+
     fieldsets = (
         ('User Information', {
             'fields': ('user',)
@@ -78,34 +98,56 @@ class QRCodeAdmin(admin.ModelAdmin):
     )
     
     actions = ['revoke_qr_codes', 'activate_qr_codes', 'regenerate_qr_codes']
-    
+
+    def get_queryset(self, request):
+        # The changelist never shows the image; skip its column so rows
+        # stay small. The change form loads it on demand when accessed.
+        return super().get_queryset(request).defer('qr_image')
+
     def token_preview(self, obj):
         return f"{obj.token[:16]}..." if obj.token else "No token"
     token_preview.short_description = 'Token'
     
     def qr_image_preview(self, obj):
-        if obj.qr_image:
-            return format_html('<img src="{}" style="max-width: 200px; max-height: 200px;" />', obj.qr_image.url)
-        return "No QR code image"
+        # Unsaved instance on the add form: no user yet, nothing to render
+        if not obj.user_id:
+            return "No QR code image"
+        # Rendered on demand by the qr_png view; nothing is read from storage
+        return format_html(
+            '<img src="{}" style="max-width: 200px; max-height: 200px;" />',
+            reverse('qr_png', args=[obj.user_id]),
+        )
     qr_image_preview.short_description = 'QR Code Preview'
     
     def revoke_qr_codes(self, request, queryset):
-        for qr in queryset:
-            qr.revoke()
-        self.message_user(request, f"{queryset.count()} QR code(s) revoked.")
+        # Capture payload identities first: cached logins for these
+        # tokens must stop resolving the moment the UPDATE lands
+        pairs = list(queryset.values_list('user__username', 'token'))
+        # One UPDATE for the whole selection instead of a save() per row;
+        # update() returns the row count, saving a second COUNT query
+        updated = queryset.update(is_active=False, revoked_at=timezone.now())
+        for username, token in pairs:
+            token_cache.invalidate(username, token)
+        self.message_user(request, f"{updated} QR code(s) revoked.")
     revoke_qr_codes.short_description = "Revoke selected QR codes"
-    
+
     def activate_qr_codes(self, request, queryset):
-        for qr in queryset:
-            qr.activate()
-        self.message_user(request, f"{queryset.count()} QR code(s) activated.")
+        updated = queryset.update(is_active=True, revoked_at=None)
+        self.message_user(request, f"{updated} QR code(s) activated.")
     activate_qr_codes.short_description = "Activate selected QR codes"
-    
+
     def regenerate_qr_codes(self, request, queryset):
-        for qr in queryset:
-            qr.generate_token()
-            qr.generate_qr_image()
-            qr.save()
-        self.message_user(request, f"{queryset.count()} QR code(s) regenerated.")
+        # Rotating the token is the whole job: nothing reads the stored
+        # image any more — the qr_png view renders PNGs on demand from
+        # the current token — so no PNG encoding or storage write happens
+        with transaction.atomic():
+            qrs = list(queryset.select_related('user'))
+            # Drop cached logins for the current tokens before touching
+            # the rows, so nothing resolves against pre-regeneration state
+            for qr in qrs:
+                token_cache.invalidate(qr.user.username, qr.token)
+                qr.token = _new_token()
+            QRCode.objects.bulk_update(qrs, ['token'])
+        self.message_user(request, f"{len(qrs)} QR code(s) regenerated.")
     regenerate_qr_codes.short_description = "Regenerate selected QR codes"
 
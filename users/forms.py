@@ -32,23 +32,19 @@ class UserRegistrationForm(UserCreationForm):
         model = CustomUser
         fields = ('username', 'email', 'first_name', 'last_name', 'phone_number', 'role', 'password1', 'password2')
     
+    # The field set is static; list it once instead of re-deriving it with
+    # defensive widget checks on every form instantiation
+    _FORM_CONTROL_FIELDS = ('username', 'email', 'first_name', 'last_name',
+                            'phone_number', 'password1', 'password2')
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Add form-control class to all fields for proper Bootstrap styling
-        for field_name, field in self.fields.items():
-            if field_name == 'role':
-                continue
-            # Check if widget has attrs, if not create it
-            if not hasattr(field.widget, 'attrs'):
-                field.widget.attrs = {}
-            elif field.widget.attrs is None:
-                field.widget.attrs = {}
-            # Update attrs to include form-control class
-            if 'class' in field.widget.attrs:
-                field.widget.attrs['class'] += ' form-control'
-            else:
-                field.widget.attrs['class'] = 'form-control'
-        
+        # Add form-control class for proper Bootstrap styling.
+        # Widget.__init__ always sets attrs to a dict, so no hasattr/None
+        # guards are needed
+        for field_name in self._FORM_CONTROL_FIELDS:
+            self.fields[field_name].widget.attrs.setdefault('class', 'form-control')
+
         # Hide role field for regular users (only admins can set roles during registration)
         # Regular users will always get 'user' role
         if not kwargs.get('initial', {}).get('is_staff'):
@@ -56,11 +52,7 @@ class UserRegistrationForm(UserCreationForm):
             self.fields['role'].initial = 'user'
         else:
             # If role is visible, ensure it has form-control class
-            if not hasattr(self.fields['role'].widget, 'attrs'):
-                self.fields['role'].widget.attrs = {}
-            elif self.fields['role'].widget.attrs is None:
-                self.fields['role'].widget.attrs = {}
-            self.fields['role'].widget.attrs.update({'class': 'form-control'})
+            self.fields['role'].widget.attrs.setdefault('class', 'form-control')
     
     def save(self, commit=True):
         user = super().save(commit=False)
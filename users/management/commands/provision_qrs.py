@@ -0,0 +1,32 @@
+"""
+------------------------------------------------------------
+ File        : users/management/commands/provision_qrs.py
+ Author      : Nandan A M
+ Description : Management command to bulk-provision QR codes for
+               users that do not have one yet, using multi-row
+               inserts instead of one save() per user.
+ Created On  : 12-Dec-2025
+ Version     : 1.0
+------------------------------------------------------------
+"""
+
+from django.core.management.base import BaseCommand
+
+from users.models import CustomUser, QRCode, _batch_tokens
+
+
+class Command(BaseCommand):
+    help = 'Create QR codes for all users that do not have one yet'
+
+    def handle(self, *args, **options):
+        users_without_qr = list(CustomUser.objects.filter(qr_code__isnull=True))
+        # Tokens come from one batched urandom read instead of a getrandom
+        # syscall per user; images are generated on demand by the qr_png view
+        tokens = _batch_tokens(len(users_without_qr))
+        created = QRCode.objects.bulk_create(
+            [QRCode(user=user, token=token)
+             for user, token in zip(users_without_qr, tokens)],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Provisioned {len(created)} QR code(s).'))
@@ -0,0 +1,20 @@
+# Generated by Django 6.0 on 2026-08-31 10:00
+
+from django.db import migrations, models
+
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_systemhealth_activitylog'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qrcode',
+            name='token',
+            field=models.CharField(default=users.models._new_token, editable=False, max_length=64, unique=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-08-31 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_qrcode_token_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='customuser',
+            name='role',
+            field=models.CharField(choices=[('admin', 'Admin'), ('staff', 'Staff'), ('user', 'User')], db_index=True, default='user', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='qrcode',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='qrcode',
+            index=models.Index(fields=['is_active', '-created_at'], name='users_qrcod_is_acti_1d2f3c_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-08-31 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_changelist_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['action', '-created_at'], name='actlog_action_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['user', 'action', '-created_at'], name='actlog_user_act_created_idx'),
+        ),
+    ]
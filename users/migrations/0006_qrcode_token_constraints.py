@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-08-31 10:25
+
+from django.db import migrations, models
+
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0005_activitylog_action_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qrcode',
+            name='token',
+            field=models.CharField(default=users.models._new_token, editable=False, max_length=64),
+        ),
+        migrations.AddConstraint(
+            model_name='qrcode',
+            constraint=models.UniqueConstraint(fields=('token',), name='uq_qrcode_token'),
+        ),
+        migrations.AddConstraint(
+            model_name='qrcode',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_active', True)), fields=('token',), name='uq_qrcode_active_token'),
+        ),
+    ]
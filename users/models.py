@@ -11,14 +11,54 @@
 """
 
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import AbstractUser
 from django.utils import timezone
+from django.utils.functional import cached_property
+import base64
+import os
 import secrets
+import threading
 import qrcode
 from io import BytesIO
-from django.core.files import File
 from PIL import Image
 
+# One builder per thread, reused across generations: constructing a
+# qrcode.QRCode rebuilds its matrix scaffolding every time, and the
+# config (version, error correction, sizing) never varies. Thread-local
+# so concurrent requests do not share mutable state.
+_qr_builders = threading.local()
+
+
+def _qr_builder():
+    builder = getattr(_qr_builders, 'builder', None)
+    if builder is None:
+        builder = qrcode.QRCode(
+            version=1,
+            error_correction=qrcode.constants.ERROR_CORRECT_L,
+            box_size=10,
+            border=4,
+        )
+        _qr_builders.builder = builder
+    builder.clear()
+    return builder
+
+
+def render_qr_png(username, token):
+    """Render the login QR PNG for a user as bytes.
+
+    The image is a pure function of (username, token), which lets the
+    qr_png view generate it on demand behind HTTP cache headers instead
+    of reading a stored file.
+    """
+    qr = _qr_builder()
+    qr.add_data(f"{username}|{token}")
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    img.save(buffer, format='PNG', optimize=False, compress_level=1)
+    return buffer.getvalue()
+
 
 class CustomUser(AbstractUser):
     """Custom user model with role-based access"""
@@ -28,7 +68,8 @@ class CustomUser(AbstractUser):
         ('user', 'User'),
     ]
     
-    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user')
+    # Indexed: the admin changelist and reports filter on role constantly
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='user', db_index=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     
     class Meta:
@@ -38,29 +79,95 @@ class CustomUser(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
+    # Cached per instance: these run on every permission check during a
+    # request, and role flags cannot change mid-request
+    @cached_property
     def is_admin_user(self):
         return self.role == 'admin' or self.is_superuser
     
+    @cached_property
     def is_staff_user(self):
         return self.role == 'staff' or self.is_staff
     
+    @cached_property
     def is_regular_user(self):
         return self.role == 'user'
 
 
+def _new_token():
+    """Default token generator; a plain function so bulk_create paths get
+    unique tokens without going through save()"""
+    return secrets.token_urlsafe(32)
+
+
+def _batch_tokens(n):
+    """Generate n tokens from a single urandom read.
+
+    secrets.token_urlsafe pays one getrandom call per token; during bulk
+    provisioning that syscall dominates, so the raw bytes are drawn once
+    and sliced. Output matches token_urlsafe(32) exactly.
+    """
+    raw = os.urandom(32 * n)
+    return [
+        base64.urlsafe_b64encode(raw[i * 32:(i + 1) * 32]).rstrip(b'=').decode('ascii')
+        for i in range(n)
+    ]
+
+
+class QRCodeManager(models.Manager):
+    """Always joins the user: __str__ and every list surface render
+    user fields, so eager loading avoids a per-row query"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+
+class ActiveQRCodeManager(QRCodeManager):
+    """Hard-codes the is_active predicate so login lookups pair with the
+    partial unique index on active tokens"""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
 class QRCode(models.Model):
     """QR Code model for user authentication"""
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE, related_name='qr_code')
-    token = models.CharField(max_length=64, unique=True, editable=False)
+    token = models.CharField(max_length=64, editable=False, default=_new_token)
     qr_image = models.ImageField(upload_to='qr_codes/', blank=True, null=True)
     is_active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     revoked_at = models.DateTimeField(null=True, blank=True)
     last_used = models.DateTimeField(null=True, blank=True)
-    
+
+    objects = QRCodeManager()
+    # Hot-path manager for authentication; admin keeps unfiltered objects
+    active = ActiveQRCodeManager()
+
     class Meta:
         verbose_name = 'QR Code'
         verbose_name_plural = 'QR Codes'
+        indexes = [
+            # Covers the admin changelist's is_active filter combined with
+            # its -created_at ordering; is_active alone is too low
+            # cardinality to be worth a standalone index
+            models.Index(fields=['is_active', '-created_at']),
+        ]
+        constraints = [
+            # Uniqueness moves from the field to explicit constraints so a
+            # small partial index can serve the hot login lookup
+            # (token, is_active=True) instead of the full B-tree.
+            # Both qr_login paths are index seeks through these: the
+            # legacy token-only lookup hits the partial index, and the
+            # username|token path seeks the OneToOne user index — no
+            # extra composite (token, is_active) index is needed.
+            models.UniqueConstraint(fields=['token'], name='uq_qrcode_token'),
+            models.UniqueConstraint(
+                fields=['token'],
+                condition=Q(is_active=True),
+                name='uq_qrcode_active_token',
+            ),
+        ]
     
     def __str__(self):
         return f"QR Code for {self.user.username}"
@@ -71,64 +178,39 @@ class QRCode(models.Model):
             self.token = secrets.token_urlsafe(32)
         return self.token
     
-    def generate_qr_image(self):
-        """Generate QR code image containing username|token for quick login"""
-        if not self.token:
-            self.generate_token()
-
-        # Encode username and token so the scanner can log in instantly
-        qr_data = f"{self.user.username}|{self.token}"
-        
-        # Create QR code
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(qr_data)
-        qr.make(fit=True)
-        
-        # Create image
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        img.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        # Save to model
-        self.qr_image.save(
-            f'qr_{self.user.username}_{self.token[:8]}.png',
-            File(buffer),
-            save=False
-        )
-    
     def revoke(self):
         """Revoke the QR code"""
         self.is_active = False
         self.revoked_at = timezone.now()
-        self.save()
+        self.save(update_fields=['is_active', 'revoked_at'])
     
     def activate(self):
         """Activate the QR code"""
         self.is_active = True
         self.revoked_at = None
-        self.save()
+        self.save(update_fields=['is_active', 'revoked_at'])
     
     def mark_as_used(self):
         """Mark QR code as used"""
         self.last_used = timezone.now()
-        self.save()
+        self.save(update_fields=['last_used'])
     
     def save(self, *args, **kwargs):
-        if not self.token:
+        # Skip the token check on targeted UPDATEs (mark_as_used fires on
+        # every QR login); the token can only be missing on a full save
+        if not kwargs.get('update_fields') and not self.token:
             self.generate_token()
-        if not self.qr_image:
-            self.generate_qr_image()
         super().save(*args, **kwargs)
 
 
+class ActivityLogManager(models.Manager):
+    """Always joins the user; log rows are only ever shown with the
+    username attached"""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('user')
+
+
 class ActivityLog(models.Model):
     """Activity log for user actions"""
     ACTION_CHOICES = [
@@ -148,7 +230,9 @@ class ActivityLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    objects = ActivityLogManager()
+
     class Meta:
         verbose_name = 'Activity Log'
         verbose_name_plural = 'Activity Logs'
@@ -156,6 +240,10 @@ class ActivityLog(models.Model):
         indexes = [
             models.Index(fields=['-created_at']),
             models.Index(fields=['user', '-created_at']),
+            # Reports and the activity-log list filter by action and page
+            # by recency; without these the queries fall back to a filesort
+            models.Index(fields=['action', '-created_at'], name='actlog_action_created_idx'),
+            models.Index(fields=['user', 'action', '-created_at'], name='actlog_user_act_created_idx'),
         ]
     
     def __str__(self):
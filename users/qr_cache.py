@@ -0,0 +1,28 @@
+"""
+------------------------------------------------------------
+ File        : users/qr_cache.py
+ Author      : Nandan A M
+ Description : Cache for rendered QR code PNG bytes, keyed by a
+               hash of the encoded payload so matrix building and
+               PNG compression run once per token.
+ Created On  : 12-Dec-2025
+ Version     : 1.0
+------------------------------------------------------------
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+# The token is a nonce: regeneration changes the key, so entries can
+# never go stale and a year-long TTL is safe
+_TTL = 31536000
+
+
+def payload_hash(username, token):
+    return hashlib.sha256(f"{username}|{token}".encode()).hexdigest()
+
+
+def get_or_build(token_hash, builder):
+    """Return cached PNG bytes for a payload hash, rendering on miss"""
+    return cache.get_or_set(f"qrimg:{token_hash}", builder, _TTL)
@@ -0,0 +1,58 @@
+"""
+------------------------------------------------------------
+ File        : users/tasks.py
+ Author      : Nandan A M
+ Description : Deferred write helpers for the users app. Buffers
+               QR code last-used timestamps in memory and flushes
+               them to the database in batches off the login path.
+ Created On  : 12-Dec-2025
+ Version     : 1.0
+------------------------------------------------------------
+"""
+
+import threading
+import time
+
+from django.utils import timezone
+
+# pk -> latest last_used timestamp; repeated logins collapse to one row
+_pending = {}
+_pending_lock = threading.Lock()
+_flush_interval = 5  # seconds
+_flusher_started = False
+
+
+def touch_qr_last_used(pk, ts=None):
+    """Record a QR login timestamp without touching the database.
+
+    The actual UPDATE happens in the background flusher, so the login
+    response does not wait on a write. At most one flush interval of
+    timestamps is lost if the process dies, which last_used tolerates.
+    """
+    global _flusher_started
+    with _pending_lock:
+        _pending[pk] = ts or timezone.now()
+        if not _flusher_started:
+            _flusher_started = True
+            threading.Thread(target=_flush_loop, daemon=True).start()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(_flush_interval)
+        flush_qr_last_used()
+
+
+def flush_qr_last_used():
+    """Write buffered timestamps as one bulk_update"""
+    from .models import QRCode
+
+    with _pending_lock:
+        if not _pending:
+            return
+        batch = dict(_pending)
+        _pending.clear()
+    QRCode.objects.bulk_update(
+        [QRCode(pk=pk, last_used=ts) for pk, ts in batch.items()],
+        ['last_used'],
+    )
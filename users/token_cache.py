@@ -0,0 +1,51 @@
+"""
+------------------------------------------------------------
+ File        : users/token_cache.py
+ Author      : Nandan A M
+ Description : Short-TTL cache for resolved QR login tokens.
+               Maps hashed QR payloads to (user_id, qr_code_id) so
+               repeat scans skip the user and token lookups.
+ Created On  : 12-Dec-2025
+ Version     : 1.0
+------------------------------------------------------------
+"""
+
+import hashlib
+
+from django.core.cache import cache
+
+# Safety net only; revoke_qr / generate_qr invalidate eagerly.
+#
+# NOTE: with no CACHES setting Django falls back to a per-process
+# LocMemCache, so eager invalidation only reaches the worker that
+# handled the revoking request. qr_login therefore revalidates
+# is_active on every cache hit rather than trusting the entry; point
+# CACHES at a shared backend (Redis/memcached) for multi-worker
+# deployments to share hits at all.
+_TTL = 300
+
+
+def _key(qr_data):
+    # Hash the payload so raw tokens never appear in cache keys
+    return 'qrtok:' + hashlib.sha256(qr_data.encode()).hexdigest()
+
+
+def get_cached_login(qr_data):
+    """Return (user_id, qr_code_id, token) for a previously validated
+    payload; the token lets the login path detect rotation"""
+    return cache.get(_key(qr_data))
+
+
+def cache_login(qr_data, user_id, qr_code_id, token):
+    cache.set(_key(qr_data), (user_id, qr_code_id, token), _TTL)
+
+
+def invalidate(username, token):
+    """Drop both payload forms a scanner may have sent for this token"""
+    cache.delete(_key(f"{username}|{token}"))
+    cache.delete(_key(token))
+
+
+def invalidate_payload(qr_data):
+    """Drop a single cached payload found stale at login time"""
+    cache.delete(_key(qr_data))
@@ -20,6 +20,7 @@ urlpatterns = [
     path('login/', views.user_login, name='login'),
     path('dashboard/', views.dashboard, name='dashboard'),
     path('generate-qr/', views.generate_qr, name='generate_qr'),
+    path('qr-image/<int:user_id>.png', views.qr_png, name='qr_png'),
     path('revoke-qr/', views.revoke_qr, name='revoke_qr'),
     path('activate-qr/', views.activate_qr, name='activate_qr'),
     path('qr-login/', views.qr_login_page, name='qr_login_page'),